@@ -3,12 +3,16 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
 
+from .mitsubishi_ae200 import MitsubishiAE200Functions
+
 DOMAIN = "mitsubishi_ae200"
 PLATFORMS = [Platform.CLIMATE]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up from config entry."""
     hass.data.setdefault(DOMAIN, {})
+    if "functions" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["functions"] = MitsubishiAE200Functions()
     hass.data[DOMAIN][entry.entry_id] = entry.data
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
@@ -17,5 +21,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        config = hass.data[DOMAIN].pop(entry.entry_id)
+        ipaddress = config["ip_address"]
+        # Drop the controller's coordinator once no loaded entry uses it
+        if not any(
+            other.data["ip_address"] == ipaddress
+            for other in hass.config_entries.async_entries(DOMAIN)
+            if other.entry_id in hass.data[DOMAIN]
+        ):
+            coordinator = hass.data[DOMAIN].get("coordinators", {}).pop(ipaddress, None)
+            # Stop its pending refreshes first so none can reopen the
+            # connection after it is closed
+            if coordinator is not None:
+                await coordinator.async_shutdown()
+            await hass.data[DOMAIN]["functions"].disconnectAsync(ipaddress)
     return unload_ok
\ No newline at end of file
@@ -1,11 +1,20 @@
 """Climate platform for AutoH Mitsubishi AE200 integration - Debug Version."""
-import logging
 import asyncio
+import logging
+import time
+import xml.etree.ElementTree as ET
+
+import websockets
 
 from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import HVACMode, ClimateEntityFeature
-from homeassistant.const import UnitOfTemperature, ATTR_TEMPERATURE
+from homeassistant.const import UnitOfTemperature, ATTR_TEMPERATURE, PRECISION_HALVES, PRECISION_WHOLE
+from homeassistant.core import callback
+from homeassistant.exceptions import PlatformNotReady
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .coordinator import AE200Coordinator
 from .mitsubishi_ae200 import MitsubishiAE200Functions
 
 _LOGGER = logging.getLogger(__name__)
@@ -13,30 +22,112 @@ DOMAIN = "mitsubishi_ae200"
 
 MIN_TEMP_F = 61
 MAX_TEMP_F = 86
+MIN_TEMP_C = 16
+MAX_TEMP_C = 30
+
+# Seconds to wait for further writes before sending a batch to the device
+WRITE_COOLDOWN = 1.5
+# Seconds a sent write stays shown while the controller has yet to report it
+WRITE_CONFIRM_WINDOW = 10
+
+_F_PER_C = 1.8
+
+
+def _c_to_f_raw(celsius):
+    return celsius * _F_PER_C + 32.0
+
+
+def _f_to_c_raw(fahrenheit):
+    return (fahrenheit - 32.0) / _F_PER_C
+
+
+# Precomputed conversions for whole-degree values; fractional readings fall
+# back to the arithmetic below
+_C_TO_F = {c: round(_c_to_f_raw(c)) for c in range(-10, 50)}
+_F_TO_C = {f: round(_f_to_c_raw(f)) for f in range(-10, 130)}
+
+# Setpoint strings in the format the controller expects
+_TEMP_STR = {c: str(c) for c in range(MIN_TEMP_C, MAX_TEMP_C + 1)}
+
+_IP_TRANS = str.maketrans(".:", "__")
+
+# Mode values used by the controller's Mode attribute
+MODE_HEAT = "HEAT"
+MODE_COOL = "COOL"
+MODE_DRY = "DRY"
+MODE_FAN = "FAN"
+MODE_AUTO = "AUTO"
+
+# Fixed power commands; _queue_write only copies from these, never mutates them
+_CMD_ON = {"Drive": "ON"}
+_CMD_OFF = {"Drive": "OFF"}
+
+_HVAC_MODES = [HVACMode.OFF, HVACMode.HEAT, HVACMode.COOL, HVACMode.DRY, HVACMode.FAN_ONLY, HVACMode.AUTO]
+
+_MODE_TO_HVAC = {
+    MODE_HEAT: HVACMode.HEAT,
+    MODE_COOL: HVACMode.COOL,
+    MODE_DRY: HVACMode.DRY,
+    MODE_FAN: HVACMode.FAN_ONLY,
+    MODE_AUTO: HVACMode.AUTO,
+}
+
+_HVAC_TO_MODE = {hvac_mode: mode for mode, hvac_mode in _MODE_TO_HVAC.items()}
+
+# Device modes that have no setpoint to report
+_MODES_WITHOUT_TARGET = frozenset({MODE_FAN})
 
 
 def celsius_to_fahrenheit(celsius):
     """Convert Celsius to Fahrenheit with proper rounding."""
     if celsius is None:
         return None
-    # Use more precise calculation and round to nearest integer
-    fahrenheit = (celsius * 9.0/5.0) + 32.0
-    return round(fahrenheit)
+    fahrenheit = _C_TO_F.get(celsius)
+    if fahrenheit is None:
+        # Use more precise calculation and round to nearest integer
+        fahrenheit = round(_c_to_f_raw(celsius))
+    return fahrenheit
 
 
 def fahrenheit_to_celsius(fahrenheit):
     """Convert Fahrenheit to Celsius with proper rounding."""
     if fahrenheit is None:
         return None
-    # Use more precise calculation and round to nearest integer  
-    celsius = (fahrenheit - 32.0) * 5.0/9.0
-    return round(celsius)
+    celsius = _F_TO_C.get(fahrenheit)
+    if celsius is None:
+        # Use more precise calculation and round to nearest integer
+        celsius = round(_f_to_c_raw(fahrenheit))
+    return celsius
+
+
+def _identity(value):
+    return value
+
+
+def _to_float(value):
+    """Convert a controller attribute to float, or None if it is empty or invalid."""
+    # The controller sends plain strings; blank-padded values count as empty
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        _LOGGER.warning("Failed to convert '%s' to float", value)
+        return None
 
 
 class AE200Device:
-    def __init__(self, ipaddress: str, deviceid: str, name: str, 
+    __slots__ = (
+        "_coordinator", "_ipaddress", "_deviceid", "_name",
+        "_mitsubishi_ae200_functions", "_username", "_password",
+        "_attributes", "_pending", "_sent", "_sent_expires", "_write_debouncer",
+    )
+
+    def __init__(self, hass, coordinator: AE200Coordinator,
+                 ipaddress: str, deviceid: str, name: str, 
                  mitsubishi_ae200_functions: MitsubishiAE200Functions, 
                  username: str, password: str):
+        self._coordinator = coordinator
         self._ipaddress = ipaddress
         self._deviceid = deviceid
         self._name = name
@@ -44,400 +135,290 @@ class AE200Device:
         self._username = username
         self._password = password
         self._attributes = {}
-        self._last_info_time_s = 0
-        self._info_lease_seconds = 30
-
-    async def _refresh_device_info_async(self):
-        try:
-            self._attributes = await self._mitsubishi_ae200_functions.getDeviceInfoAsync(
-                self._ipaddress, self._deviceid, self._username, self._password
-            )
-            self._last_info_time_s = asyncio.get_event_loop().time()
-            _LOGGER.info(f"DEBUG: Device {self._name} ALL attributes: {self._attributes}")
-        except Exception as e:
-            _LOGGER.error(f"Failed to refresh {self._name}: {e}")
-            raise
-
-    async def _get_info(self, key, default_value):
-        current_time = asyncio.get_event_loop().time()
-        if not self._attributes or (current_time - self._last_info_time_s) > self._info_lease_seconds:
-            await self._refresh_device_info_async()
-        value = self._attributes.get(key, default_value)
-        _LOGGER.debug(f"DEBUG: Getting {key} = {value} for {self._name}")
-        return value
-
-    async def _to_float(self, value):
-        try:
-            result = float(value) if value is not None and str(value).strip() != "" else None
-            _LOGGER.debug(f"DEBUG: Converting '{value}' to float: {result}")
-            return result
-        except (ValueError, TypeError) as e:
-            _LOGGER.warning(f"DEBUG: Failed to convert '{value}' to float: {e}")
-            return None
-
-    def getName(self):
-        return self._name
-
-    async def getRoomTemperature(self):
-        try:
-            temp = await self._to_float(await self._get_info("InletTemp", None))
-            _LOGGER.debug(f"DEBUG: Room temperature for {self._name}: {temp}°C")
-            return temp
-        except Exception as e:
-            _LOGGER.error(f"Error getting room temp for {self._name}: {e}")
-            return None
-
-    async def getTargetTemperature(self):
-        try:
-            mode = await self.getMode()
-            _LOGGER.info(f"DEBUG: Current mode is {mode} for {self._name}")
-            
-            # Check both temperature setpoints and log them
-            settemp1 = await self._get_info("SetTemp1", None)
-            settemp2 = await self._get_info("SetTemp2", None)
-            settemp = await self._get_info("SetTemp", None)
-            
-            _LOGGER.info(f"DEBUG: Temperature values - SetTemp1: {settemp1}, SetTemp2: {settemp2}, SetTemp: {settemp}")
-            
-            if mode == "HEAT":
-                temp = await self._to_float(settemp2)
-                _LOGGER.info(f"DEBUG: Using SetTemp2 for HEAT mode: {temp}")
-                return temp
-            else:
-                temp = await self._to_float(settemp1)
-                _LOGGER.info(f"DEBUG: Using SetTemp1 for COOL/AUTO mode: {temp}")
-                return temp
-        except Exception as e:
-            _LOGGER.error(f"Error getting target temp for {self._name}: {e}")
-            return None
-
-    async def getMode(self):
-        try:
-            mode = await self._get_info("Mode", "AUTO")
-            _LOGGER.debug(f"DEBUG: Mode for {self._name}: {mode}")
-            return mode
-        except Exception as e:
-            _LOGGER.error(f"Error getting mode for {self._name}: {e}")
-            return "AUTO"
-
-    async def isPowerOn(self):
-        try:
-            drive_status = await self._get_info("Drive", "OFF")
-            is_on = drive_status == "ON"
-            _LOGGER.debug(f"DEBUG: Power status for {self._name}: Drive={drive_status}, PowerOn={is_on}")
-            return is_on
-        except Exception as e:
-            _LOGGER.error(f"Error getting power status for {self._name}: {e}")
-            return False
-
-    async def setTemperature(self, temperature):
-        """Set temperature on the device. Temperature should be in Celsius."""
-        try:
-            _LOGGER.info(f"DEBUG: ===== SETTING TEMPERATURE =====")
-            _LOGGER.info(f"DEBUG: Input temperature: {temperature}°C for {self._name}")
-            
-            # Get current state before setting
-            current_mode = await self.getMode()
-            current_power = await self.isPowerOn()
-            current_target = await self.getTargetTemperature()
-            
-            _LOGGER.info(f"DEBUG: Current state - Mode: {current_mode}, Power: {current_power}, Target: {current_target}°C")
-            
-            # Round temperature properly
-            temp_value = int(round(temperature))
-            temp_str = str(temp_value)
-            
-            _LOGGER.info(f"DEBUG: Setting temperature to {temp_value}°C (rounded from {temperature})")
-            
-            # Clear cache to get fresh data after command
-            self._last_info_time_s = 0
-            
-            # Try multiple strategies to set temperature
-            _LOGGER.info(f"DEBUG: Strategy 1 - Mode-specific temperature setting")
-            
-            if current_mode == "HEAT":
-                _LOGGER.info(f"DEBUG: Sending SetTemp2={temp_str} for HEAT mode")
-                await self._mitsubishi_ae200_functions.sendAsync(
-                    self._ipaddress, self._deviceid, {"SetTemp2": temp_str}, 
-                    self._username, self._password
-                )
+        self._pending = {}
+        self._sent = {}
+        self._sent_expires = 0.0
+        self._write_debouncer = Debouncer(
+            hass, _LOGGER, cooldown=WRITE_COOLDOWN, immediate=False,
+            function=self._flush_pending_writes,
+        )
+
+    def _set_attributes(self, attributes):
+        """Store the attributes most recently fetched by the coordinator."""
+        # A controller that has not applied a sent write yet still reports
+        # the old value; keep showing the write until it is reported back
+        # or the confirmation window has passed
+        if self._sent:
+            if time.monotonic() >= self._sent_expires:
+                self._sent = {}
             else:
-                _LOGGER.info(f"DEBUG: Sending SetTemp1={temp_str} for {current_mode} mode")
-                await self._mitsubishi_ae200_functions.sendAsync(
-                    self._ipaddress, self._deviceid, {"SetTemp1": temp_str}, 
-                    self._username, self._password
-                )
-            
-            # Wait for device to process
-            await asyncio.sleep(2)
-            
-            # Strategy 2: Try the generic SetTemp parameter
-            _LOGGER.info(f"DEBUG: Strategy 2 - Generic SetTemp parameter")
+                self._sent = {key: value for key, value in self._sent.items() if attributes.get(key) != value}
+        # Writes still waiting on the debouncer take precedence over what
+        # the controller reported
+        self._attributes = {**attributes, **self._sent, **self._pending}
+
+    async def _queue_write(self, command):
+        """Queue attribute writes to be sent together after the cooldown."""
+        self._pending.update(command)
+        self._attributes.update(command)
+        await self._write_debouncer.async_call()
+
+    async def _flush_pending_writes(self):
+        """Send every queued write in a single command, then refresh."""
+        # The debouncer ignores calls made while this is running, so keep
+        # going until writes queued during the send or refresh are out too
+        while self._pending:
+            command, self._pending = self._pending, {}
+            # Overlay the command while it is in flight so a poll landing
+            # mid-send does not revert it either
+            self._sent.update(command)
+            self._sent_expires = time.monotonic() + WRITE_CONFIRM_WINDOW
             try:
+                _LOGGER.debug("DEBUG: Sending %s to %s", command, self._name)
                 await self._mitsubishi_ae200_functions.sendAsync(
-                    self._ipaddress, self._deviceid, {"SetTemp": temp_str}, 
+                    self._ipaddress, self._deviceid, command,
                     self._username, self._password
                 )
-                _LOGGER.info(f"DEBUG: Sent SetTemp={temp_str}")
             except Exception as e:
-                _LOGGER.warning(f"DEBUG: SetTemp failed (may be normal): {e}")
-            
-            await asyncio.sleep(2)
-            
-            # Strategy 3: Try setting both SetTemp1 and SetTemp2
-            _LOGGER.info(f"DEBUG: Strategy 3 - Setting both temperature parameters")
-            try:
-                await self._mitsubishi_ae200_functions.sendAsync(
-                    self._ipaddress, self._deviceid, {
-                        "SetTemp1": temp_str,
-                        "SetTemp2": temp_str
-                    }, 
-                    self._username, self._password
-                )
-                _LOGGER.info(f"DEBUG: Sent both SetTemp1={temp_str} and SetTemp2={temp_str}")
-            except Exception as e:
-                _LOGGER.warning(f"DEBUG: Dual temperature setting failed: {e}")
-            
-            await asyncio.sleep(2)
-            
-            # Verify the change took effect
-            _LOGGER.info(f"DEBUG: Verifying temperature change...")
-            self._last_info_time_s = 0  # Force refresh
-            new_target = await self.getTargetTemperature()
-            new_mode = await self.getMode()
-            
-            _LOGGER.info(f"DEBUG: After setting - Mode: {new_mode}, New Target: {new_target}°C")
-            
-            if new_target == temp_value:
-                _LOGGER.info(f"DEBUG: ✅ Temperature successfully set to {temp_value}°C")
+                _LOGGER.error("Failed to send %s to %s: %s", command, self._name, e)
+                # Let the refresh show what the controller actually has
+                for key in command:
+                    self._sent.pop(key, None)
             else:
-                _LOGGER.warning(f"DEBUG: ❌ Temperature setting may have failed. Expected: {temp_value}°C, Got: {new_target}°C")
-            
-            _LOGGER.info(f"DEBUG: ===== TEMPERATURE SETTING COMPLETE =====")
-            
-        except Exception as e:
-            _LOGGER.error(f"Failed to set temperature for {self._name}: {e}")
-            raise
+                # Start the window once the controller has accepted the write
+                self._sent_expires = time.monotonic() + WRITE_CONFIRM_WINDOW
+            self._coordinator.async_write_flushed()
+            await self._coordinator.async_request_refresh()
+
+    def async_shutdown(self):
+        """Cancel any queued writes."""
+        self._write_debouncer.async_shutdown()
+
+    # The getters below read the attributes from the latest coordinator
+    # refresh; they never touch the network
+
+    def getRoomTemperature(self):
+        temp = _to_float(self._attributes.get("InletTemp"))
+        _LOGGER.debug("DEBUG: Room temperature for %s: %s°C", self._name, temp)
+        return temp
+
+    def getTargetTemperature(self):
+        mode = self.getMode()
+        key = "SetTemp2" if mode == MODE_HEAT else "SetTemp1"
+        temp = _to_float(self._attributes.get(key))
+        _LOGGER.debug("DEBUG: Using %s for %s mode: %s", key, mode, temp)
+        return temp
+
+    def getMode(self):
+        mode = self._attributes.get("Mode", MODE_AUTO)
+        _LOGGER.debug("DEBUG: Mode for %s: %s", self._name, mode)
+        return mode
+
+    def isPowerOn(self):
+        drive_status = self._attributes.get("Drive", "OFF")
+        is_on = drive_status == "ON"
+        _LOGGER.debug("DEBUG: Power status for %s: Drive=%s, PowerOn=%s", self._name, drive_status, is_on)
+        return is_on
+
+    async def setTemperature(self, temperature):
+        """Set temperature on the device. Temperature should be in Celsius."""
+        _LOGGER.debug("DEBUG: ===== SETTING TEMPERATURE =====")
+        _LOGGER.debug("DEBUG: Input temperature: %s°C for %s", temperature, self._name)
+        
+        # Round to a whole degree within the range the controller accepts
+        temp_value = max(MIN_TEMP_C, min(MAX_TEMP_C, int(round(temperature))))
+        temp_str = _TEMP_STR[temp_value]
+        
+        _LOGGER.debug("DEBUG: Setting temperature to %s°C (rounded from %s)", temp_value, temperature)
+        
+        # Set every setpoint field so the controller picks up the change
+        # regardless of the current mode. Rapid changes (e.g. a slider
+        # drag) collapse into one command carrying the final value.
+        await self._queue_write({
+            "SetTemp": temp_str,
+            "SetTemp1": temp_str,
+            "SetTemp2": temp_str
+        })
+        
+        _LOGGER.debug("DEBUG: ===== TEMPERATURE SETTING COMPLETE =====")
 
     async def setMode(self, mode):
-        try:
-            _LOGGER.info(f"DEBUG: Setting mode to {mode} for {self._name}")
-            await self._mitsubishi_ae200_functions.sendAsync(
-                self._ipaddress, self._deviceid, {"Mode": mode}, 
-                self._username, self._password
-            )
-            self._last_info_time_s = 0
-            await asyncio.sleep(2)
-            
-            # Verify mode change
-            new_mode = await self.getMode()
-            _LOGGER.info(f"DEBUG: Mode changed from ? to {new_mode}")
-        except Exception as e:
-            _LOGGER.error(f"Failed to set mode for {self._name}: {e}")
-            raise
+        _LOGGER.debug("DEBUG: Setting mode to %s for %s", mode, self._name)
+        await self._queue_write({"Mode": mode})
 
     async def powerOn(self):
-        try:
-            _LOGGER.info(f"DEBUG: Powering on {self._name}")
-            await self._mitsubishi_ae200_functions.sendAsync(
-                self._ipaddress, self._deviceid, {"Drive": "ON"}, 
-                self._username, self._password
-            )
-            self._last_info_time_s = 0
-            await asyncio.sleep(2)
-            
-            # Verify power change
-            is_on = await self.isPowerOn()
-            _LOGGER.info(f"DEBUG: Power status after ON command: {is_on}")
-        except Exception as e:
-            _LOGGER.error(f"Failed to power on {self._name}: {e}")
-            raise
+        _LOGGER.debug("DEBUG: Powering on %s", self._name)
+        await self._queue_write(_CMD_ON)
 
     async def powerOff(self):
-        try:
-            _LOGGER.info(f"DEBUG: Powering off {self._name}")
-            await self._mitsubishi_ae200_functions.sendAsync(
-                self._ipaddress, self._deviceid, {"Drive": "OFF"}, 
-                self._username, self._password
-            )
-            self._last_info_time_s = 0
-            await asyncio.sleep(2)
-            
-            # Verify power change
-            is_on = await self.isPowerOn()
-            _LOGGER.info(f"DEBUG: Power status after OFF command: {is_on}")
-        except Exception as e:
-            _LOGGER.error(f"Failed to power off {self._name}: {e}")
-            raise
+        _LOGGER.debug("DEBUG: Powering off %s", self._name)
+        await self._queue_write(_CMD_OFF)
+
 
+class AE200Climate(CoordinatorEntity, ClimateEntity):
+    # Identical for every entity, so shared at class level
+    _attr_hvac_modes = _HVAC_MODES
+    _attr_supported_features = ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.TURN_ON | ClimateEntityFeature.TURN_OFF
+    # The controller only takes whole-degree setpoints in either unit
+    _attr_target_temperature_step = 1
 
-class AE200Climate(ClimateEntity):
-    def __init__(self, hass, device: AE200Device, controllerid: str, ipaddress: str):
+    def __init__(self, hass, coordinator: AE200Coordinator, device: AE200Device, controllerid: str, ip_suffix: str, use_fahrenheit: bool = True):
+        super().__init__(coordinator)
         self._device = device
-        ip_suffix = ipaddress.replace(".", "_").replace(":", "_")
         self._attr_unique_id = f"mitsubishi_ae200_{controllerid}_{ip_suffix}_{device._deviceid}"
-        self._attr_name = f"AutoH {device.getName()}"
+        self._attr_name = f"AutoH {device._name}"
         
-        self._attr_hvac_modes = [HVACMode.OFF, HVACMode.HEAT, HVACMode.COOL, HVACMode.AUTO]
-        self._attr_supported_features = ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.TURN_ON | ClimateEntityFeature.TURN_OFF
-        self._attr_temperature_unit = UnitOfTemperature.FAHRENHEIT
+        # The controller always works in Celsius; pick the display unit and
+        # its conversions once instead of branching on every read
+        if use_fahrenheit:
+            self._attr_temperature_unit = UnitOfTemperature.FAHRENHEIT
+            self._attr_min_temp = MIN_TEMP_F
+            self._attr_max_temp = MAX_TEMP_F
+            self._attr_precision = PRECISION_WHOLE
+            self._to_display = celsius_to_fahrenheit
+            self._from_display = fahrenheit_to_celsius
+        else:
+            self._attr_temperature_unit = UnitOfTemperature.CELSIUS
+            self._attr_min_temp = MIN_TEMP_C
+            self._attr_max_temp = MAX_TEMP_C
+            # Room readings come in half degrees Celsius
+            self._attr_precision = PRECISION_HALVES
+            self._to_display = _identity
+            self._from_display = _identity
         
-        self._current_temperature = None
-        self._target_temperature = None
-        self._hvac_mode = HVACMode.OFF
+        self._attr_current_temperature = None
+        self._attr_target_temperature = None
+        self._attr_hvac_mode = HVACMode.OFF
         self._last_hvac_mode = HVACMode.COOL
-
-    @property
-    def unique_id(self):
-        return self._attr_unique_id
-
-    @property
-    def name(self):
-        return self._attr_name
-
-    @property
-    def temperature_unit(self):
-        return self._attr_temperature_unit
-
-    @property
-    def current_temperature(self):
-        if self._current_temperature is None:
-            return None
-        fahrenheit = celsius_to_fahrenheit(self._current_temperature)
-        _LOGGER.debug(f"DEBUG: Converting current temp {self._current_temperature}°C to {fahrenheit}°F")
-        return fahrenheit
-
-    @property
-    def target_temperature(self):
-        if self._target_temperature is None:
-            return None
-        fahrenheit = celsius_to_fahrenheit(self._target_temperature)
-        _LOGGER.debug(f"DEBUG: Converting target temp {self._target_temperature}°C to {fahrenheit}°F")
-        return fahrenheit
-
-    @property
-    def min_temp(self):
-        return MIN_TEMP_F
-
-    @property
-    def max_temp(self):
-        return MAX_TEMP_F
-
-    @property
-    def hvac_mode(self):
-        return self._hvac_mode
-
-    @property
-    def hvac_modes(self):
-        return self._attr_hvac_modes
-
-    @property
-    def supported_features(self):
-        return self._attr_supported_features
-
-    @property
-    def should_poll(self):
-        return True
+        self._written_state_key = None
+        self._update_from_coordinator()
 
     async def async_turn_on(self):
         try:
-            _LOGGER.info(f"DEBUG: Turning on {self.name}")
-            await self._device.powerOn()
-            self._hvac_mode = self._last_hvac_mode
+            _LOGGER.debug("DEBUG: Turning on %s", self.name)
+            self._attr_hvac_mode = self._last_hvac_mode
             self.async_write_ha_state()
+            await self._device.powerOn()
         except Exception as e:
-            _LOGGER.error(f"Failed to turn on {self.name}: {e}")
+            _LOGGER.error("Failed to turn on %s: %s", self.name, e)
             raise
 
     async def async_turn_off(self):
         try:
-            _LOGGER.info(f"DEBUG: Turning off {self.name}")
-            await self._device.powerOff()
-            self._hvac_mode = HVACMode.OFF
+            _LOGGER.debug("DEBUG: Turning off %s", self.name)
+            self._attr_hvac_mode = HVACMode.OFF
             self.async_write_ha_state()
+            await self._device.powerOff()
         except Exception as e:
-            _LOGGER.error(f"Failed to turn off {self.name}: {e}")
+            _LOGGER.error("Failed to turn off %s: %s", self.name, e)
             raise
 
     async def async_set_temperature(self, **kwargs):
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if temperature is not None:
             try:
-                _LOGGER.info(f"DEBUG: ===== HOME ASSISTANT TEMPERATURE CHANGE =====")
-                _LOGGER.info(f"DEBUG: Home Assistant requesting temperature change to {temperature}°F for {self.name}")
+                _LOGGER.debug("DEBUG: ===== HOME ASSISTANT TEMPERATURE CHANGE =====")
+                _LOGGER.debug("DEBUG: Home Assistant requesting temperature change to %s%s for %s", temperature, self._attr_temperature_unit, self.name)
                 
-                temp_celsius = fahrenheit_to_celsius(temperature)
-                _LOGGER.info(f"DEBUG: Converted {temperature}°F to {temp_celsius}°C")
+                temp_celsius = self._from_display(temperature)
+                _LOGGER.debug("DEBUG: Converted %s%s to %s°C", temperature, self._attr_temperature_unit, temp_celsius)
                 
+                # Show the new setpoint right away; the writes below are only
+                # queued and the next coordinator refresh confirms them
+                self._attr_target_temperature = self._to_display(temp_celsius)
+                self.async_write_ha_state()
+
                 # Make sure device is powered on before setting temperature
-                is_powered = await self._device.isPowerOn()
+                is_powered = self._device.isPowerOn()
                 if not is_powered:
-                    _LOGGER.info(f"DEBUG: Device is off, turning on first...")
+                    _LOGGER.debug("DEBUG: Device is off, turning on first...")
                     await self._device.powerOn()
-                    await asyncio.sleep(2)
                 
                 await self._device.setTemperature(temp_celsius)
-                self._target_temperature = temp_celsius
-                self.async_write_ha_state()
                 
-                _LOGGER.info(f"DEBUG: Home Assistant temperature change completed")
-                _LOGGER.info(f"DEBUG: ===== HOME ASSISTANT TEMPERATURE CHANGE COMPLETE =====")
+                _LOGGER.debug("DEBUG: Home Assistant temperature change completed")
+                _LOGGER.debug("DEBUG: ===== HOME ASSISTANT TEMPERATURE CHANGE COMPLETE =====")
             except Exception as e:
-                _LOGGER.error(f"Failed to set temperature for {self.name}: {e}")
+                _LOGGER.error("Failed to set temperature for %s: %s", self.name, e)
                 raise
 
     async def async_set_hvac_mode(self, hvac_mode):
         try:
-            _LOGGER.info(f"DEBUG: Setting HVAC mode to {hvac_mode} for {self.name}")
+            _LOGGER.debug("DEBUG: Setting HVAC mode to %s for %s", hvac_mode, self.name)
             
             if hvac_mode == HVACMode.OFF:
+                self._attr_hvac_mode = HVACMode.OFF
+                self.async_write_ha_state()
                 await self._device.powerOff()
-                self._hvac_mode = HVACMode.OFF
             else:
+                self._attr_hvac_mode = hvac_mode
+                self._last_hvac_mode = hvac_mode
+                self.async_write_ha_state()
                 await self._device.powerOn()
-                mode_map = {
-                    HVACMode.HEAT: "HEAT",
-                    HVACMode.COOL: "COOL", 
-                    HVACMode.AUTO: "AUTO",
-                }
-                device_mode = mode_map.get(hvac_mode, "AUTO")
+                device_mode = _HVAC_TO_MODE.get(hvac_mode, MODE_AUTO)
                 await self._device.setMode(device_mode)
-                self._hvac_mode = hvac_mode
-                self._last_hvac_mode = hvac_mode
-                
-            self.async_write_ha_state()
-            _LOGGER.info(f"DEBUG: HVAC mode change completed: {hvac_mode}")
+
+            _LOGGER.debug("DEBUG: HVAC mode change completed: %s", hvac_mode)
         except Exception as e:
-            _LOGGER.error(f"Failed to set HVAC mode for {self.name}: {e}")
+            _LOGGER.error("Failed to set HVAC mode for %s: %s", self.name, e)
             raise
 
-    async def async_update(self):
-        try:
-            _LOGGER.debug(f"DEBUG: Updating {self.name}...")
-            
-            self._current_temperature = await self._device.getRoomTemperature()
-            
-            if await self._device.isPowerOn():
-                self._target_temperature = await self._device.getTargetTemperature()
-                mode = await self._device.getMode()
-                
-                if mode == "HEAT":
-                    self._hvac_mode = HVACMode.HEAT
-                    self._last_hvac_mode = HVACMode.HEAT
-                elif mode == "COOL":
-                    self._hvac_mode = HVACMode.COOL
-                    self._last_hvac_mode = HVACMode.COOL
-                else:
-                    self._hvac_mode = HVACMode.AUTO
-                    self._last_hvac_mode = HVACMode.AUTO
+    def _update_from_coordinator(self):
+        """Populate entity state from the coordinator's latest data."""
+        device = self._device
+        attrs = (self.coordinator.data or {}).get(device._deviceid)
+        if attrs is None:
+            return
+        device._set_attributes(attrs)
+        to_display = self._to_display
+
+        # The controller reports Celsius; convert once here rather than on
+        # every state read
+        self._attr_current_temperature = to_display(device.getRoomTemperature())
+
+        if device.isPowerOn():
+            mode = device.getMode()
+            if mode in _MODES_WITHOUT_TARGET:
+                self._attr_target_temperature = None
             else:
-                self._target_temperature = None
-                self._hvac_mode = HVACMode.OFF
-                
-            _LOGGER.debug(f"DEBUG: Update completed - Current: {self._current_temperature}°C, Target: {self._target_temperature}°C, Mode: {self._hvac_mode}")
-                
-        except Exception as e:
-            _LOGGER.error(f"Failed to update {self.name}: {e}")
+                self._attr_target_temperature = to_display(device.getTargetTemperature())
+
+            hvac_mode = _MODE_TO_HVAC.get(mode, HVACMode.AUTO)
+            self._attr_hvac_mode = hvac_mode
+            self._last_hvac_mode = hvac_mode
+        else:
+            self._attr_target_temperature = None
+            self._attr_hvac_mode = HVACMode.OFF
+
+        _LOGGER.debug("DEBUG: Update completed - Current: %s%s, Target: %s%s, Mode: %s", self._attr_current_temperature, self._attr_temperature_unit, self._attr_target_temperature, self._attr_temperature_unit, self._attr_hvac_mode)
+
+    async def async_will_remove_from_hass(self):
+        await super().async_will_remove_from_hass()
+        self._device.async_shutdown()
+
+    @property
+    def available(self):
+        """Unavailable when the controller is unreachable or stops reporting this group."""
+        return super().available and self._device._deviceid in (self.coordinator.data or {})
+
+    def _state_key(self):
+        """Return the values that make up this entity's visible state."""
+        return (self.available, self._attr_current_temperature,
+                self._attr_target_temperature, self._attr_hvac_mode)
+
+    @callback
+    def async_write_ha_state(self):
+        # Remember what was last written so polls can be compared against it
+        self._written_state_key = self._state_key()
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self):
+        self._update_from_coordinator()
+        # Most polls report nothing new; skip the state machine write then
+        if self._state_key() == self._written_state_key:
+            return
+        super()._handle_coordinator_update()
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
@@ -447,26 +428,48 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     ipaddress = config["ip_address"]
     username = config["username"]
     password = config["password"]
+    use_fahrenheit = config.get("temperature_unit", "fahrenheit") == "fahrenheit"
 
-    mitsubishi_ae200_functions = MitsubishiAE200Functions()
+    mitsubishi_ae200_functions = hass.data[DOMAIN]["functions"]
     devices = []
-    
+
+    # An unreachable controller is retried by Home Assistant instead of
+    # leaving the entry loaded with no entities
     try:
         group_list = await mitsubishi_ae200_functions.getDevicesAsync(ipaddress, username, password)
+    except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException, ET.ParseError) as exc:
+        raise PlatformNotReady(f"Could not list devices on {ipaddress}: {exc}") from exc
+
+    # One coordinator per controller polls all of its devices in a single
+    # request, shared by every config entry pointing at that controller
+    coordinators = hass.data[DOMAIN].setdefault("coordinators", {})
+    coordinator = coordinators.get(ipaddress)
+    if coordinator is None:
+        coordinator = AE200Coordinator(
+            hass, mitsubishi_ae200_functions, ipaddress,
+            [group["id"] for group in group_list], username, password
+        )
+        coordinators[ipaddress] = coordinator
+    if coordinator.data is None:
+        # Have Home Assistant retry setup rather than add entities that
+        # have no state to show
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            raise PlatformNotReady(f"Could not fetch device state from {ipaddress}")
+
+    ip_suffix = ipaddress.translate(_IP_TRANS)
+    for group in group_list:
+        device_id = group["id"]
+        device_name = group["name"]
         
-        for group in group_list:
-            device_id = group["id"]
-            device_name = group["name"]
-            
-            device = AE200Device(ipaddress, device_id, device_name, mitsubishi_ae200_functions, username, password)
-            climate_entity = AE200Climate(hass, device, controllerid, ipaddress)
-            devices.append(climate_entity)
-
-        if devices:
-            async_add_entities(devices, update_before_add=True)
-            _LOGGER.info(f"Added {len(devices)} climate entities")
-        else:
-            _LOGGER.warning("No devices found")
-            
-    except Exception as exc:
-        _LOGGER.error(f"Setup error: {exc}", exc_info=True)
\ No newline at end of file
+        device = AE200Device(hass, coordinator, ipaddress, device_id, device_name, mitsubishi_ae200_functions, username, password)
+        climate_entity = AE200Climate(hass, coordinator, device, controllerid, ip_suffix, use_fahrenheit)
+        devices.append(climate_entity)
+
+    if devices:
+        # Entities are already populated from the coordinator's first
+        # refresh, so skip Home Assistant's per-entity pre-update
+        async_add_entities(devices, update_before_add=False)
+        _LOGGER.info("Added %s climate entities", len(devices))
+    else:
+        _LOGGER.warning("No devices found")
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""Data update coordinator for AutoH Mitsubishi AE200 integration."""
+import asyncio
+import logging
+import random
+import xml.etree.ElementTree as ET
+from datetime import timedelta
+
+import websockets
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .mitsubishi_ae200 import MitsubishiAE200Functions
+
+_LOGGER = logging.getLogger(__name__)
+
+UPDATE_INTERVAL = timedelta(seconds=30)
+# Upper bound the poll interval backs off to while nothing is changing
+MAX_UPDATE_INTERVAL = timedelta(seconds=60)
+# Spread of the random offset that keeps controllers from polling in step
+UPDATE_JITTER_SECONDS = 2.0
+
+
+class AE200Coordinator(DataUpdateCoordinator):
+    """Fetch the state of every device on one controller in a single request."""
+
+    def __init__(self, hass, mitsubishi_ae200_functions: MitsubishiAE200Functions,
+                 ipaddress: str, device_ids: list, username: str, password: str):
+        """Initialize the coordinator."""
+        self._base_interval = UPDATE_INTERVAL + timedelta(
+            seconds=random.uniform(-UPDATE_JITTER_SECONDS, UPDATE_JITTER_SECONDS)
+        )
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"mitsubishi_ae200 {ipaddress}",
+            update_interval=self._base_interval,
+        )
+        self._mitsubishi_ae200_functions = mitsubishi_ae200_functions
+        self._ipaddress = ipaddress
+        self._device_ids = device_ids
+        self._username = username
+        self._password = password
+        # Set while the refresh after a write is outstanding, so a stale
+        # read-back is not mistaken for an idle controller
+        self._confirming_write = False
+
+    @callback
+    def async_write_flushed(self):
+        """Return to the base poll interval after a write is sent."""
+        self.update_interval = self._base_interval
+        self._confirming_write = True
+
+    async def _async_update_data(self):
+        """Return a dict of device attributes keyed by device id."""
+        try:
+            data = await self._mitsubishi_ae200_functions.getDevicesInfoAsync(
+                self._ipaddress, self._device_ids, self._username, self._password
+            )
+        except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException, ET.ParseError) as e:
+            raise UpdateFailed(f"Error communicating with controller {self._ipaddress}: {e}") from e
+
+        # Poll less often while the controller keeps reporting the same state
+        # and go back to the base interval as soon as anything changes
+        confirming_write, self._confirming_write = self._confirming_write, False
+        if data == self.data and not confirming_write:
+            self.update_interval = min(self.update_interval * 2, MAX_UPDATE_INTERVAL)
+        else:
+            self.update_interval = self._base_interval
+        return data
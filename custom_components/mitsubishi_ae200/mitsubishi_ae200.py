@@ -1,4 +1,5 @@
 """Mitsubishi AE200 communication library."""
+import asyncio
 import logging
 import websockets
 from websockets.extensions import permessage_deflate
@@ -7,6 +8,9 @@ import base64
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds to wait for a reply, matching the connection's ping_timeout
+REQUEST_TIMEOUT = 10
+
 # XML payloads for communication
 getUnitsPayload = """<?xml version="1.0" encoding="UTF-8" ?>
 <Packet>
@@ -44,6 +48,11 @@ class MitsubishiAE200Functions:
     def __init__(self):
         """Initialize the communication handler."""
         self._authenticated = False
+        # One persistent connection per controller, reused across requests
+        self._connections = {}
+        self._locks = {}
+        # Groups already reported missing, so each is only warned about once
+        self._missing_groups = set()
 
     def _create_auth_header(self, username: str, password: str) -> str:
         """Create basic auth header."""
@@ -68,92 +77,119 @@ class MitsubishiAE200Functions:
 
         return params
 
+    async def _requestAsync(self, address: str, payload: str, username: str = None, password: str = None):
+        """Send a payload over the controller's shared connection and return the reply."""
+        lock = self._locks.setdefault(address, asyncio.Lock())
+        async with lock:
+            websocket = self._connections.get(address)
+            if websocket is not None:
+                try:
+                    return await self._exchangeAsync(address, websocket, payload)
+                except websockets.exceptions.ConnectionClosed:
+                    _LOGGER.debug("Connection to %s was closed, reconnecting", address)
+
+            params = self._get_connection_params(address, username, password)
+            websocket = await websockets.connect(**params)
+            self._connections[address] = websocket
+            return await self._exchangeAsync(address, websocket, payload)
+
+    async def _exchangeAsync(self, address: str, websocket, payload: str):
+        """Send a payload and wait for its reply, dropping the connection on failure."""
+        try:
+            # The lock is held for the whole exchange, so a controller that
+            # never answers must not stall every later request behind it
+            async with asyncio.timeout(REQUEST_TIMEOUT):
+                await websocket.send(payload)
+                return await websocket.recv()
+        except BaseException:
+            # An interrupted exchange could leave its reply queued for the
+            # next request, so never reuse the connection after one. Abort
+            # rather than close: a close handshake with an unresponsive
+            # controller would hold the lock for up to close_timeout more
+            if self._connections.get(address) is websocket:
+                del self._connections[address]
+            websocket.transport.abort()
+            raise
+
+    async def disconnectAsync(self, address: str):
+        """Close the shared connection to a controller."""
+        websocket = self._connections.pop(address, None)
+        self._locks.pop(address, None)
+        if websocket is not None:
+            await websocket.close()
+
     async def authenticate(self, address: str, username: str, password: str) -> bool:
         """Test authentication with the AE200 controller."""
         try:
-            _LOGGER.info(f"Testing authentication to {address}")
+            _LOGGER.info("Testing authentication to %s", address)
             params = self._get_connection_params(address, username, password)
             
             async with websockets.connect(**params) as websocket:
                 # Send a test request to verify connection
                 await websocket.send(getUnitsPayload)
-                response = await websocket.recv()
+                await websocket.recv()
                 
                 # If we get a response, authentication succeeded
-                _LOGGER.info(f"Authentication successful for AE200 controller at {address}")
+                _LOGGER.info("Authentication successful for AE200 controller at %s", address)
                 return True
                     
         except websockets.exceptions.ConnectionClosedError as e:
-            _LOGGER.error(f"Connection closed during authentication: {e}")
+            _LOGGER.error("Connection closed during authentication: %s", e)
             return False
         except Exception as e:
-            _LOGGER.error(f"Authentication error for {address}: {e}")
+            _LOGGER.error("Authentication error for %s: %s", address, e)
             return False
 
     async def getDevicesAsync(self, address: str, username: str = None, password: str = None):
         """Get list of devices from the controller."""
-        try:
-            _LOGGER.info(f"Getting devices from controller at {address}")
-            params = self._get_connection_params(address, username, password)
-            
-            async with websockets.connect(**params) as websocket:
-                await websocket.send(getUnitsPayload)
-                unitsResultStr = await websocket.recv()
-                
-                _LOGGER.debug(f"Raw device list response: {unitsResultStr}")
-                
-                unitsResultXML = ET.fromstring(unitsResultStr)
-
-                groupList = []
-                for r in unitsResultXML.findall('./DatabaseManager/ControlGroup/MnetList/MnetRecord'):
-                    group_id = r.get('Group')
-                    group_name = r.get('GroupNameWeb')
-                    if group_id and group_name:
-                        groupList.append({
-                            "id": group_id,
-                            "name": group_name
-                        })
-
-                _LOGGER.info(f"Found {len(groupList)} devices on controller {address}: {groupList}")
-                return groupList
-                
-        except Exception as e:
-            _LOGGER.error(f"Error getting devices from {address}: {e}")
-            raise
+        _LOGGER.info("Getting devices from controller at %s", address)
+        unitsResultStr = await self._requestAsync(address, getUnitsPayload, username, password)
 
-    async def getDeviceInfoAsync(self, address: str, deviceId: str, username: str = None, password: str = None):
-        """Get detailed information for a specific device."""
-        try:
-            params = self._get_connection_params(address, username, password)
-            
-            async with websockets.connect(**params) as websocket:
-                getMnetDetailsPayload = getMnetDetails([deviceId])
-                await websocket.send(getMnetDetailsPayload)
-                mnetDetailsResultStr = await websocket.recv()
-                
-                _LOGGER.debug(f"Device {deviceId} raw response: {mnetDetailsResultStr}")
-                
-                mnetDetailsResultXML = ET.fromstring(mnetDetailsResultStr)
-                node = mnetDetailsResultXML.find('./DatabaseManager/Mnet')
-                
-                if node is not None:
-                    return node.attrib
-                else:
-                    _LOGGER.warning(f"No device data found for device {deviceId}")
-                    return {}
-                    
-        except Exception as e:
-            _LOGGER.error(f"Error getting device info for {deviceId} on {address}: {e}")
-            raise
+        _LOGGER.debug("Raw device list response: %s", unitsResultStr)
+
+        unitsResultXML = ET.fromstring(unitsResultStr)
+
+        groupList = []
+        for r in unitsResultXML.findall('./DatabaseManager/ControlGroup/MnetList/MnetRecord'):
+            group_id = r.get('Group')
+            group_name = r.get('GroupNameWeb')
+            if group_id and group_name:
+                groupList.append({
+                    "id": group_id,
+                    "name": group_name
+                })
+
+        _LOGGER.info("Found %s devices on controller %s: %s", len(groupList), address, groupList)
+        return groupList
+
+    async def getDevicesInfoAsync(self, address: str, deviceIds: list, username: str = None, password: str = None):
+        """Get detailed information for several devices in a single request."""
+        getMnetDetailsPayload = getMnetDetails(deviceIds)
+        mnetDetailsResultStr = await self._requestAsync(address, getMnetDetailsPayload, username, password)
+
+        _LOGGER.debug("Devices %s raw response: %s", deviceIds, mnetDetailsResultStr)
+
+        mnetDetailsResultXML = ET.fromstring(mnetDetailsResultStr)
+
+        devicesInfo = {}
+        for node in mnetDetailsResultXML.findall('./DatabaseManager/Mnet'):
+            group_id = node.get('Group')
+            if group_id:
+                devicesInfo[group_id] = node.attrib
+
+        missing = {(address, deviceId) for deviceId in deviceIds if deviceId not in devicesInfo}
+        newly_missing = missing - self._missing_groups
+        if newly_missing:
+            _LOGGER.warning("No device data found for devices %s on %s", sorted(deviceId for _, deviceId in newly_missing), address)
+        # Forget groups that came back so a later loss is reported again
+        self._missing_groups = (self._missing_groups - {(address, deviceId) for deviceId in deviceIds}) | missing
+
+        return devicesInfo
 
     async def sendAsync(self, address: str, deviceId: str, attributes: dict, username: str = None, password: str = None):
         """Send commands to a specific device."""
-        try:
-            params = self._get_connection_params(address, username, password)
-            
-            async with websockets.connect(**params) as websocket:
-                attrs = " ".join([f'{key}="{attributes[key]}"' for key in attributes])
-                payload = f"""<?xml version="1.0" encoding="UTF-8" ?>
+        attrs = " ".join([f'{key}="{attributes[key]}"' for key in attributes])
+        payload = f"""<?xml version="1.0" encoding="UTF-8" ?>
 <Packet>
 <Command>setRequest</Command>
 <DatabaseManager>
@@ -161,27 +197,20 @@ class MitsubishiAE200Functions:
 </DatabaseManager>
 </Packet>
 """
-                _LOGGER.info(f"Sending command to device {deviceId}: {attributes}")
-                _LOGGER.debug(f"Full payload: {payload}")
-                
-                await websocket.send(payload)
-                
-                # Wait for response to confirm command was received
-                response = await websocket.recv()
-                _LOGGER.debug(f"Command response for device {deviceId}: {response}")
-                
-                # Parse response to check for errors
-                try:
-                    root = ET.fromstring(response)
-                    error_node = root.find('.//Error')
-                    if error_node is not None:
-                        error_msg = error_node.get('Message', 'Unknown error')
-                        _LOGGER.error(f"Device command error: {error_msg}")
-                        raise Exception(f"Device command failed: {error_msg}")
-                except ET.ParseError:
-                    # If we can't parse the response, assume success
-                    pass
-                    
-        except Exception as e:
-            _LOGGER.error(f"Error sending command to device {deviceId} on {address}: {e}")
-            raise
\ No newline at end of file
+        _LOGGER.debug("Sending command to device %s: %s", deviceId, attributes)
+        _LOGGER.debug("Full payload: %s", payload)
+
+        # Wait for response to confirm command was received
+        response = await self._requestAsync(address, payload, username, password)
+        _LOGGER.debug("Command response for device %s: %s", deviceId, response)
+
+        # Parse response to check for errors
+        try:
+            root = ET.fromstring(response)
+            error_node = root.find('.//Error')
+            if error_node is not None:
+                error_msg = error_node.get('Message', 'Unknown error')
+                raise Exception(f"Device command failed: {error_msg}")
+        except ET.ParseError:
+            # If we can't parse the response, assume success
+            pass
\ No newline at end of file